@@ -18,6 +18,21 @@ class Settings(BaseSettings):
     # Default provider
     default_provider: str = Field(default="ollama")
 
+    # Keep-alive connections opened per configured provider at startup
+    prewarm_connections: int = Field(default=4)
+
+    # Negotiate HTTP/2 with OpenAI-compatible providers. Concurrent chats
+    # then share one multiplexed TLS connection instead of one TCP
+    # connection each, and SSE chunks avoid HTTP/1.1 head-of-line blocking.
+    # The cost is a little more CPU for HTTP/2 framing. Servers that only
+    # speak HTTP/1.1 fall back automatically via ALPN. Ollama always uses
+    # HTTP/1.1.
+    enable_http2: bool = Field(default=True)
+
+    # Tokens arriving within this window (ms) are sent as one SSE event;
+    # 0 sends every token on its own
+    chat_sse_batch_ms: float = Field(default=10.0)
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
@@ -44,6 +59,9 @@ DEFAULT_LOCAL_MAX_TOKENS = 800
 DEFAULT_REMOTE_CONTEXT = 8192
 DEFAULT_REMOTE_MAX_TOKENS = 2048
 MAX_HISTORY_MESSAGES = 20
+# Messages kept per session; older ones are evicted. Far above the prompt
+# window so the visible chat history is not cut short.
+MAX_STORED_MESSAGES = 500
 
 # Provider presets for OpenAI-compatible services
 PROVIDER_PRESETS = {
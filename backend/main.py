@@ -1,10 +1,15 @@
 """FastAPI entry point for Local AI WebUI backend."""
 
+import asyncio
+import sys
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.routers import chat, sessions, models, providers
+from backend.providers.factory import use_provider, close_providers
 from backend.config import settings
+from backend.utils.search import close_search_client
 
 app = FastAPI(
     title="Local AI WebUI",
@@ -28,6 +33,34 @@ app.include_router(models.router)
 app.include_router(providers.router)
 
 
+@app.on_event("startup")
+async def prewarm_provider_connections():
+    """Warm the connection pools of the configured providers.
+
+    The first chat turn to a remote provider would otherwise pay the full
+    TCP + TLS handshake before any token arrives.
+    """
+    targets = [("ollama", settings.ollama_base_url, None)]
+    if settings.openai_compat_base_url:
+        targets.append((
+            "openai_compat",
+            settings.openai_compat_base_url,
+            settings.openai_compat_api_key,
+        ))
+    await asyncio.gather(*(_prewarm(*target) for target in targets))
+
+
+async def _prewarm(provider_type, base_url, api_key):
+    async with use_provider(provider_type, base_url, api_key) as provider:
+        await provider.prewarm(settings.prewarm_connections)
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_providers()
+    await close_search_client()
+
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok", "default_provider": settings.default_provider}
@@ -35,9 +68,15 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+    # Production-style serve: no reloader process. Use start.py or
+    # `uvicorn --reload` for development.
     uvicorn.run(
         "backend.main:app",
         host=settings.host,
         port=settings.port,
-        reload=True,
+        # uvloop does not support Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Outlive upstream proxies' idle timeout (~60s) to avoid reset races
+        timeout_keep_alive=75,
     )
@@ -1,9 +1,16 @@
 """Abstract base class for LLM providers."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import AsyncGenerator, Optional
+
+import httpx
 from pydantic import BaseModel
 
+# Model lists change rarely; serve them from memory for this many seconds
+MODEL_CACHE_TTL = 30.0
+
 
 class ModelInfo(BaseModel):
     """Normalized model metadata."""
@@ -21,16 +28,97 @@ class ProviderConfig(BaseModel):
     api_key: Optional[str] = None
 
 
+async def iter_raw_lines(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+    """Yield newline-delimited lines of a streamed response as raw bytes.
+
+    Scans the network chunks directly instead of decoding every chunk to
+    ``str`` first, so only the payloads that are actually parsed get
+    decoded. Trailing ``\r`` is stripped; empty lines are passed through.
+    """
+    buf = bytearray()
+    async for chunk in response.aiter_bytes(chunk_size=8192):
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            line_end = end - 1 if end > start and buf[end - 1] == 0x0D else end
+            yield bytes(buf[start:line_end])
+            start = end + 1
+        del buf[:start]
+    if buf:
+        yield bytes(buf.rstrip(b"\r"))
+
+
 class BaseProvider(ABC):
     """Abstract provider interface.
 
     Both Ollama and OpenAI-compatible providers implement this interface.
     The rest of the app (chat, sessions, memory) does not care which
     provider is active.
+
+    Each instance owns a long-lived ``httpx.AsyncClient`` so that chat turns
+    and model listings reuse warm keep-alive connections instead of paying
+    a fresh TCP/TLS handshake per call.
     """
 
-    def __init__(self, config: ProviderConfig):
+    # Cheap endpoint used to open connections ahead of the first request
+    prewarm_path: str = "/"
+
+    def __init__(
+        self,
+        config: ProviderConfig,
+        headers: Optional[dict] = None,
+        http2: bool = False,
+    ):
         self.config = config
+        self._client = httpx.AsyncClient(
+            base_url=config.base_url,
+            headers=headers,
+            http2=http2,
+            timeout=httpx.Timeout(300.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=32,
+                max_keepalive_connections=16,
+                keepalive_expiry=60.0,
+            ),
+        )
+        # (fetched_at, models) and {model_id: (fetched_at, info)}
+        self._models_cache: Optional[tuple[float, list[ModelInfo]]] = None
+        self._model_info_cache: dict[str, tuple[float, ModelInfo]] = {}
+
+    def _cached_models(self) -> Optional[list[ModelInfo]]:
+        """Return the cached model list if it is still fresh."""
+        if self._models_cache and time.monotonic() - self._models_cache[0] < MODEL_CACHE_TTL:
+            return self._models_cache[1]
+        return None
+
+    def _cached_model_info(self, model_id: str) -> Optional[ModelInfo]:
+        """Return cached metadata for *model_id* if it is still fresh."""
+        entry = self._model_info_cache.get(model_id)
+        if entry and time.monotonic() - entry[0] < MODEL_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def invalidate_model_cache(self) -> None:
+        """Drop cached model lists and metadata."""
+        self._models_cache = None
+        self._model_info_cache.clear()
+
+    async def prewarm(self, connections: int = 1) -> None:
+        """Open up to *connections* keep-alive sockets in parallel.
+
+        Failures are ignored — an unreachable provider simply stays cold.
+        """
+        async def _touch():
+            try:
+                await self._client.head(self.prewarm_path, timeout=2.0)
+            except httpx.HTTPError:
+                pass
+
+        await asyncio.gather(*(_touch() for _ in range(connections)))
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
 
     @abstractmethod
     async def send_message(
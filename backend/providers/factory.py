@@ -0,0 +1,125 @@
+"""Shared provider instances.
+
+Providers hold a pooled HTTP client and small metadata caches, so the
+routers reuse one instance per (provider_type, base_url, api_key) instead
+of building a fresh provider for every request. Keeping the instance alive
+is what lets keep-alive connections (and TLS sessions) carry over between
+chat turns.
+
+Request handlers borrow providers through ``use_provider`` so the cache
+knows which ones are busy: a provider evicted from the LRU is closed right
+away when idle, or by its last user once the in-flight request finishes.
+"""
+
+import asyncio
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from backend.config import settings
+
+from .base import BaseProvider, ProviderConfig
+from .ollama import OllamaProvider
+from .openai_compat import OpenAICompatProvider
+
+# Bounded LRU so many ad-hoc configurations (e.g. connection tests with
+# different keys) cannot pile up pools forever
+MAX_CACHED_PROVIDERS = 32
+
+# Used when neither the request nor the environment names an endpoint
+DEFAULT_OPENAI_COMPAT_BASE_URL = "https://api.openai.com/v1"
+
+_provider_cache: OrderedDict[tuple[str, str, Optional[str]], BaseProvider] = OrderedDict()
+
+# Requests currently using each provider (only non-zero counts are kept)
+_active: Counter[BaseProvider] = Counter()
+
+# Evicted while in use; closed when their last user is done
+_retired: set[BaseProvider] = set()
+
+# Closes of idle evicted providers that are still running
+_closing: set[asyncio.Task] = set()
+
+
+def get_provider(
+    provider_type: str,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> BaseProvider:
+    """Return the shared provider for this configuration, creating it once.
+
+    A missing ``base_url`` or ``api_key`` falls back to the configured
+    defaults; Ollama never takes an API key.
+    """
+    if provider_type == "ollama":
+        base_url = base_url or settings.ollama_base_url
+        api_key = None
+    else:
+        base_url = (
+            base_url
+            or settings.openai_compat_base_url
+            or DEFAULT_OPENAI_COMPAT_BASE_URL
+        )
+        api_key = api_key or settings.openai_compat_api_key
+
+    key = (provider_type, base_url, api_key)
+    provider = _provider_cache.get(key)
+    if provider is not None:
+        _provider_cache.move_to_end(key)
+        return provider
+
+    config = ProviderConfig(base_url=base_url, api_key=api_key)
+    if provider_type == "ollama":
+        provider = OllamaProvider(config)
+    else:
+        # Ollama only speaks HTTP/1.1, so HTTP/2 is for remote APIs only
+        provider = OpenAICompatProvider(config, http2=settings.enable_http2)
+    _provider_cache[key] = provider
+    if len(_provider_cache) > MAX_CACHED_PROVIDERS:
+        _, evicted = _provider_cache.popitem(last=False)
+        _retire(evicted)
+    return provider
+
+
+def _retire(provider: BaseProvider):
+    """Close an evicted provider's pool now, or after its in-flight requests."""
+    if _active[provider]:
+        _retired.add(provider)
+        return
+    task = asyncio.get_running_loop().create_task(provider.aclose())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+@asynccontextmanager
+async def use_provider(
+    provider_type: str,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> AsyncIterator[BaseProvider]:
+    """Borrow the shared provider for the duration of a request.
+
+    Takes the same arguments as ``get_provider``. While borrowed, the
+    provider is not closed even if the LRU evicts it.
+    """
+    provider = get_provider(provider_type, base_url, api_key)
+    _active[provider] += 1
+    try:
+        yield provider
+    finally:
+        _active[provider] -= 1
+        if not _active[provider]:
+            del _active[provider]
+            if provider in _retired:
+                _retired.discard(provider)
+                await provider.aclose()
+
+
+async def close_providers():
+    """Close every provider's connection pool, evicted ones included."""
+    for provider in [*_provider_cache.values(), *_retired]:
+        await provider.aclose()
+    _provider_cache.clear()
+    _retired.clear()
+    if _closing:
+        await asyncio.gather(*_closing)
@@ -4,12 +4,14 @@ Connects to a local Ollama instance at localhost:11434.
 Supports streaming chat completions and model metadata.
 """
 
-import json
+import time
 from typing import AsyncGenerator, Optional
 
 import httpx
 
-from .base import BaseProvider, ModelInfo, ProviderConfig
+from backend.utils.serialization import JSONDecodeError, loads as json_loads
+
+from .base import BaseProvider, ModelInfo, ProviderConfig, iter_raw_lines
 
 
 class OllamaProvider(BaseProvider):
@@ -34,10 +36,8 @@ class OllamaProvider(BaseProvider):
                     elif part.get("type") == "image_url":
                         url = part["image_url"]["url"]
                         # Strip data URI prefix: "data:image/...;base64,"
-                        if url.startswith("data:"):
-                            base64_data = url.split(",", 1)[1] if "," in url else url
-                        else:
-                            base64_data = url
+                        comma = url.find(",") if url.startswith("data:") else -1
+                        base64_data = url[comma + 1:] if comma != -1 else url
                         images.append(base64_data)
                 new_msg = {**msg, "content": "\n".join(text_parts)}
                 if images:
@@ -66,33 +66,31 @@ class OllamaProvider(BaseProvider):
             },
         }
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(300.0, connect=10.0)) as client:
-            async with client.stream(
-                "POST",
-                f"{self.config.base_url}/api/chat",
-                json=payload,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                        if "message" in data and "content" in data["message"]:
-                            token = data["message"]["content"]
-                            if token:
-                                yield token
-                        if data.get("done", False):
-                            return
-                    except json.JSONDecodeError:
-                        continue
+        async with self._client.stream("POST", "/api/chat", json=payload) as response:
+            response.raise_for_status()
+            async for line in iter_raw_lines(response):
+                if not line:
+                    continue
+                try:
+                    data = json_loads(line)
+                    if "message" in data and "content" in data["message"]:
+                        token = data["message"]["content"]
+                        if token:
+                            yield token
+                    if data.get("done", False):
+                        return
+                except JSONDecodeError:
+                    continue
 
     async def list_models(self) -> list[ModelInfo]:
         """List locally available Ollama models."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.config.base_url}/api/tags")
-            response.raise_for_status()
-            data = response.json()
+        cached = self._cached_models()
+        if cached is not None:
+            return cached
+
+        response = await self._client.get("/api/tags", timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
 
         models = []
         for m in data.get("models", []):
@@ -108,18 +106,23 @@ class OllamaProvider(BaseProvider):
                     provider="ollama",
                 )
             )
+        self._models_cache = (time.monotonic(), models)
         return models
 
     async def get_model_info(self, model_id: str) -> Optional[ModelInfo]:
         """Get detailed metadata for an Ollama model using /api/show."""
+        cached = self._cached_model_info(model_id)
+        if cached is not None:
+            return cached
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.config.base_url}/api/show",
-                    json={"name": model_id},
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._client.post(
+                "/api/show",
+                json={"name": model_id},
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
 
             details = data.get("details", {})
             model_info = data.get("model_info", {})
@@ -131,7 +134,7 @@ class OllamaProvider(BaseProvider):
                     context_length = value
                     break
 
-            return ModelInfo(
+            info = ModelInfo(
                 id=model_id,
                 name=model_id,
                 parameter_count=details.get("parameter_size"),
@@ -139,14 +142,15 @@ class OllamaProvider(BaseProvider):
                 context_length=context_length,
                 provider="ollama",
             )
+            self._model_info_cache[model_id] = (time.monotonic(), info)
+            return info
         except httpx.HTTPError:
             return None
 
     async def validate_connection(self) -> bool:
         """Check if Ollama is running and reachable."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(self.config.base_url)
-                return response.status_code == 200
+            response = await self._client.get("/", timeout=5.0)
+            return response.status_code == 200
         except httpx.HTTPError:
             return False
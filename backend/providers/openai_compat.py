@@ -4,41 +4,67 @@ Supports any service that implements the OpenAI chat completions API:
 OpenAI, DeepSeek, Groq, Together, OpenRouter, LM Studio, vLLM, etc.
 """
 
-import json
+import time
 from typing import AsyncGenerator, Optional
 
 import httpx
 
-from .base import BaseProvider, ModelInfo, ProviderConfig
+from backend.utils.serialization import JSONDecodeError, loads as json_loads
+
+from .base import BaseProvider, ModelInfo, ProviderConfig, iter_raw_lines
 
 
 class OpenAICompatProvider(BaseProvider):
     """Provider for OpenAI-compatible API services."""
 
-    def __init__(self, config: ProviderConfig):
-        super().__init__(config)
+    prewarm_path = "/models"
 
-    def _headers(self) -> dict:
-        """Build request headers with optional auth."""
-        headers = {"Content-Type": "application/json"}
-        if self.config.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api_key}"
-        return headers
+    def __init__(self, config: ProviderConfig, http2: bool = False):
+        # Auth never changes after construction, so the headers are built
+        # once and baked into the pooled client
+        self._cached_headers = {"Content-Type": "application/json"}
+        if config.api_key:
+            self._cached_headers["Authorization"] = f"Bearer {config.api_key}"
+        super().__init__(config, headers=self._cached_headers, http2=http2)
 
     @staticmethod
     def _strip_vision_content(messages: list[dict]) -> list[dict]:
         """Downgrade vision content-array messages to plain text for non-vision models."""
         stripped = []
         for msg in messages:
-            if isinstance(msg.get("content"), list):
-                text_parts = [
-                    p["text"] for p in msg["content"] if p.get("type") == "text"
-                ]
-                stripped.append({**msg, "content": "\n".join(text_parts)})
+            content = msg.get("content")
+            if isinstance(content, list):
+                text_parts = [p["text"] for p in content if p.get("type") == "text"]
+                # dict.copy() is a single C-level copy, unlike {**msg, ...}
+                new_msg = msg.copy()
+                new_msg["content"] = "\n".join(text_parts)
+                stripped.append(new_msg)
             else:
                 stripped.append(msg)
         return stripped
 
+    async def _stream_completion(self, payload: dict) -> AsyncGenerator[str, None]:
+        """POST a streaming completion on the pooled client and yield tokens."""
+        async with self._client.stream("POST", "/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            async for line in iter_raw_lines(response):
+                if not line:
+                    continue
+                if line.startswith(b"data: "):
+                    data_bytes = line[6:]
+                    if data_bytes.strip() == b"[DONE]":
+                        return
+                    try:
+                        data = json_loads(data_bytes)
+                        choices = data.get("choices", [])
+                        if choices:
+                            delta = choices[0].get("delta", {})
+                            token = delta.get("content")
+                            if token:
+                                yield token
+                    except JSONDecodeError:
+                        continue
+
     async def send_message(
         self,
         messages: list[dict],
@@ -51,8 +77,14 @@ class OpenAICompatProvider(BaseProvider):
         If the API rejects the vision content-array format (400),
         automatically retries with images stripped out.
         """
-        has_vision_content = any(
-            isinstance(m.get("content"), list) for m in messages
+        # Only the latest user turn ever carries a vision content-array
+        has_vision_content = next(
+            (
+                isinstance(m.get("content"), list)
+                for m in reversed(messages)
+                if m.get("role") == "user"
+            ),
+            False,
         )
 
         payload = {
@@ -63,75 +95,30 @@ class OpenAICompatProvider(BaseProvider):
             "stream": True,
         }
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(300.0, connect=10.0)) as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    f"{self.config.base_url}/chat/completions",
-                    json=payload,
-                    headers=self._headers(),
-                ) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if not line:
-                            continue
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str.strip() == "[DONE]":
-                                return
-                            try:
-                                data = json.loads(data_str)
-                                choices = data.get("choices", [])
-                                if choices:
-                                    delta = choices[0].get("delta", {})
-                                    token = delta.get("content")
-                                    if token:
-                                        yield token
-                            except json.JSONDecodeError:
-                                continue
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 400 and has_vision_content:
-                    # Model likely doesn't support vision — retry with text only
-                    fallback_messages = self._strip_vision_content(messages)
-                    payload["messages"] = fallback_messages
-                    yield "[Note: This model does not support image inputs. Responding to text only.]\n\n"
-                    async with client.stream(
-                        "POST",
-                        f"{self.config.base_url}/chat/completions",
-                        json=payload,
-                        headers=self._headers(),
-                    ) as response:
-                        response.raise_for_status()
-                        async for line in response.aiter_lines():
-                            if not line:
-                                continue
-                            if line.startswith("data: "):
-                                data_str = line[6:]
-                                if data_str.strip() == "[DONE]":
-                                    return
-                                try:
-                                    data = json.loads(data_str)
-                                    choices = data.get("choices", [])
-                                    if choices:
-                                        delta = choices[0].get("delta", {})
-                                        token = delta.get("content")
-                                        if token:
-                                            yield token
-                                except json.JSONDecodeError:
-                                    continue
-                else:
-                    raise
+        try:
+            async for token in self._stream_completion(payload):
+                yield token
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 400 and has_vision_content:
+                # Model likely doesn't support vision — retry with text only
+                fallback_messages = self._strip_vision_content(messages)
+                payload["messages"] = fallback_messages
+                yield "[Note: This model does not support image inputs. Responding to text only.]\n\n"
+                async for token in self._stream_completion(payload):
+                    yield token
+            else:
+                raise
 
     async def list_models(self) -> list[ModelInfo]:
         """List models from the OpenAI-compatible API."""
+        cached = self._cached_models()
+        if cached is not None:
+            return cached
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.config.base_url}/models",
-                    headers=self._headers(),
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._client.get("/models", timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
 
             models = []
             for m in data.get("data", []):
@@ -142,26 +129,29 @@ class OpenAICompatProvider(BaseProvider):
                         provider="openai_compat",
                     )
                 )
+            self._models_cache = (time.monotonic(), models)
             return models
         except httpx.HTTPError:
             return []
 
     async def get_model_info(self, model_id: str) -> Optional[ModelInfo]:
         """Get model info. OpenAI API has limited metadata, so we return basics."""
+        cached = self._cached_model_info(model_id)
+        if cached is not None:
+            return cached
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.config.base_url}/models/{model_id}",
-                    headers=self._headers(),
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._client.get(f"/models/{model_id}", timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
 
-            return ModelInfo(
+            info = ModelInfo(
                 id=data.get("id", model_id),
                 name=data.get("id", model_id),
                 provider="openai_compat",
             )
+            self._model_info_cache[model_id] = (time.monotonic(), info)
+            return info
         except httpx.HTTPError:
             return ModelInfo(
                 id=model_id,
@@ -172,11 +162,7 @@ class OpenAICompatProvider(BaseProvider):
     async def validate_connection(self) -> bool:
         """Test connection by listing models."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"{self.config.base_url}/models",
-                    headers=self._headers(),
-                )
-                return response.status_code == 200
+            response = await self._client.get("/models", timeout=5.0)
+            return response.status_code == 200
         except httpx.HTTPError:
             return False
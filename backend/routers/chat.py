@@ -1,29 +1,94 @@
 """Chat router — send messages and stream responses via SSE."""
 
-import base64
+import asyncio
+import binascii
+import hashlib
 import io
-import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from sse_starlette.sse import EventSourceResponse
-from PyPDF2 import PdfReader
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from pypdf import PdfReader
+
+try:
+    # Optional, not in requirements.txt: C-backed (MuPDF) text extraction,
+    # much faster than pypdf, but AGPL-licensed. Used when installed.
+    import pymupdf
+except ImportError:  # pragma: no cover - pypdf handles PDFs on its own
+    pymupdf = None
 
 from backend.sessions.manager import session_manager
 from backend.sessions.memory import build_prompt_messages
-from backend.providers.base import ProviderConfig
-from backend.providers.ollama import OllamaProvider
-from backend.providers.openai_compat import OpenAICompatProvider
+from backend.providers.factory import use_provider
 from backend.config import settings
 from backend.utils.search import web_search
+from backend.utils.serialization import (
+    JSONDecodeError,
+    dumps_bytes as json_dumps_bytes,
+    loads as json_loads,
+)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+# Grounding instructions appended to the system prompt when web search is on
+SEARCH_INSTRUCTION = (
+    "\n\nIMPORTANT: The user has enabled web search. Their message includes "
+    "real-time search results with the current date and time. You MUST:"
+    "\n- Base your answer ONLY on the provided search results and conversation context."
+    "\n- NEVER invent facts, URLs, dates, or numbers that are not in the search results."
+    "\n- If the search results do not contain enough information, say so honestly."
+    "\n- Cite the source when referencing specific data from the results."
+)
+
+
+@lru_cache(maxsize=64)
+def _with_search(system_prompt: Optional[str]) -> str:
+    """Return the system prompt with the web-search grounding appended."""
+    return (system_prompt or "") + SEARCH_INSTRUCTION
+
+
+# Flush a token batch early once it holds this many tokens
+SSE_BATCH_MAX_TOKENS = 16
+
+# Queued by the provider reader after the last token
+_STREAM_END = object()
+
+# Stop proxies (nginx etc.) and caches from buffering the token stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+# Static SSE framing, encoded once at import time
+_SSE_SUFFIX = b"\n\n"
+# Token frames are built around the escaped string, with no dict to encode
+_SSE_TOKEN_PREFIX = b'event: token\ndata: {"token":'
+_SSE_TOKEN_SUFFIX = b"}" + _SSE_SUFFIX
+
+
+def _sse_event(event: str, payload: dict) -> bytes:
+    """Frame *payload* as one pre-encoded SSE event."""
+    return b"event: " + event.encode() + b"\ndata: " + json_dumps_bytes(payload) + _SSE_SUFFIX
+
+
+def _sse_token(text: str) -> bytes:
+    """Frame a token event — the per-token hot path.
+
+    ``encode_basestring_ascii`` (C-accelerated) returns the quoted JSON
+    string with everything non-ASCII escaped, so it encodes as ASCII.
+    """
+    return _SSE_TOKEN_PREFIX + encode_basestring_ascii(text).encode("ascii") + _SSE_TOKEN_SUFFIX
+
 
 class FileAttachment(BaseModel):
     name: str
     type: str
-    dataUrl: str
+    # Megabytes of base64 — passed through untouched, never echoed in reprs
+    dataUrl: str = Field(..., repr=False)
 
 
 class ChatRequest(BaseModel):
@@ -33,59 +98,141 @@ class ChatRequest(BaseModel):
     files: list[FileAttachment] = []
 
 
+def _parse_chat_request(body) -> ChatRequest:
+    """Build a ChatRequest from a decoded JSON body with targeted checks.
+
+    Only the fields the handler relies on are type-checked; ``dataUrl``
+    (possibly tens of MB of base64) is taken as-is instead of being
+    re-scanned by a full pydantic validation pass.
+    """
+    if (
+        not isinstance(body, dict)
+        or not isinstance(body.get("session_id"), str)
+        or not isinstance(body.get("message"), str)
+    ):
+        raise HTTPException(status_code=422, detail="session_id and message must be strings")
+
+    web_search = body.get("web_search", False)
+    if not isinstance(web_search, bool):
+        raise HTTPException(status_code=422, detail="web_search must be a boolean")
+
+    raw_files = body.get("files", [])
+    if not isinstance(raw_files, list):
+        raise HTTPException(status_code=422, detail="files must be a list")
+    files = []
+    for f in raw_files:
+        if not (
+            isinstance(f, dict)
+            and isinstance(f.get("name"), str)
+            and isinstance(f.get("type"), str)
+            and isinstance(f.get("dataUrl"), str)
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail="each file needs string name, type and dataUrl",
+            )
+        files.append(FileAttachment.model_construct(
+            name=f["name"], type=f["type"], dataUrl=f["dataUrl"]
+        ))
+
+    return ChatRequest.model_construct(
+        session_id=body["session_id"],
+        message=body["message"],
+        web_search=web_search,
+        files=files,
+    )
+
+
+# Extracted text keyed by (sha256 of the file bytes, name, type), so the same
+# attachment re-sent on a later turn skips parsing. Filled from worker threads.
+_EXTRACT_CACHE_SIZE = 32
+_extract_cache: OrderedDict[tuple[bytes, str, str], str] = OrderedDict()
+_extract_cache_lock = threading.Lock()
+
+
+def _pdf_page_texts(file_bytes: bytes) -> list[str]:
+    """Extract the text of each PDF page, preferring PyMuPDF over pypdf."""
+    if pymupdf is not None:
+        with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+            return [page.get_text() for page in doc]
+    reader = PdfReader(io.BytesIO(file_bytes))
+    return [page.extract_text() for page in reader.pages]
+
+
+def _file_bytes_to_text(name: str, mime_type: str, file_bytes: bytes) -> str:
+    """Turn decoded attachment bytes into a labelled text block."""
+    if mime_type == "application/pdf" or name.lower().endswith(".pdf"):
+        pages = []
+        for i, text in enumerate(_pdf_page_texts(file_bytes)):
+            if text:
+                pages.append(f"--- Page {i + 1} ---\n{text}")
+        if pages:
+            return f"[Content of {name}]\n" + "\n\n".join(pages)
+        return f"[Attached PDF: {name} — could not extract text (scanned/image PDF?)]"
+    else:
+        # Text-based files: .txt, .csv, .json, .md, etc.
+        text = file_bytes.decode("utf-8", errors="replace")
+        return f"[Content of {name}]\n{text}"
+
+
 def _extract_file_text(f: "FileAttachment") -> str:
-    """Extract readable text from a file attachment's base64 data URL."""
+    """Extract readable text from a file attachment's base64 data URL.
+
+    Blocking (PDF parsing is CPU-bound) — call it via ``asyncio.to_thread``.
+    """
     try:
-        # Strip the data URI prefix to get raw base64
-        raw_b64 = f.dataUrl.split(",", 1)[1] if "," in f.dataUrl else f.dataUrl
-        file_bytes = base64.b64decode(raw_b64)
-
-        if f.type == "application/pdf" or f.name.lower().endswith(".pdf"):
-            reader = PdfReader(io.BytesIO(file_bytes))
-            pages = []
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text()
-                if text:
-                    pages.append(f"--- Page {i + 1} ---\n{text}")
-            if pages:
-                return f"[Content of {f.name}]\n" + "\n\n".join(pages)
-            return f"[Attached PDF: {f.name} — could not extract text (scanned/image PDF?)]"
-        else:
-            # Text-based files: .txt, .csv, .json, .md, etc.
-            text = file_bytes.decode("utf-8", errors="replace")
-            return f"[Content of {f.name}]\n{text}"
+        # Strip the data URI prefix and decode the payload with the C-level
+        # decoder directly (no split() list, no b64decode wrapper)
+        comma = f.dataUrl.find(",")
+        raw_b64 = f.dataUrl[comma + 1:] if comma != -1 else f.dataUrl
+        file_bytes = binascii.a2b_base64(raw_b64)
+
+        key = (hashlib.sha256(file_bytes).digest(), f.name, f.type)
+        with _extract_cache_lock:
+            cached = _extract_cache.get(key)
+            if cached is not None:
+                _extract_cache.move_to_end(key)
+                return cached
+
+        text = _file_bytes_to_text(f.name, f.type, file_bytes)
+        with _extract_cache_lock:
+            _extract_cache[key] = text
+            if len(_extract_cache) > _EXTRACT_CACHE_SIZE:
+                _extract_cache.popitem(last=False)
+        return text
     except Exception as e:
         return f"[Attached file: {f.name} — failed to read: {e}]"
 
 
-def _get_provider(session):
-    """Instantiate the correct provider based on session settings."""
+def _use_provider(session):
+    """Borrow the shared provider for the session's settings."""
     provider_type = session.settings.provider
     if provider_type == "ollama":
-        return OllamaProvider(
-            ProviderConfig(base_url=settings.ollama_base_url)
-        )
-    else:
-        base_url = (
-            session.settings.base_url
-            or settings.openai_compat_base_url
-            or "https://api.openai.com/v1"
-        )
-        api_key = session.settings.api_key or settings.openai_compat_api_key
-        return OpenAICompatProvider(
-            ProviderConfig(base_url=base_url, api_key=api_key)
-        )
+        # Chat always talks to the configured Ollama server
+        return use_provider(provider_type)
+    return use_provider(
+        provider_type, session.settings.base_url, session.settings.api_key
+    )
 
 
 @router.post("/send")
-async def send_message(request: ChatRequest):
+async def send_message(raw_request: Request):
     """Send a message and stream the response as SSE.
 
+    The body has the ``ChatRequest`` shape but is parsed by hand (see
+    ``_parse_chat_request``) to skip validating the attachment payloads.
+
     1. Add user message to session history
     2. Build prompt with sliding window memory
     3. Stream tokens back to client
     4. Save complete assistant response to session
     """
+    try:
+        body = json_loads(await raw_request.body())
+    except JSONDecodeError:
+        raise HTTPException(status_code=422, detail="Request body must be valid JSON")
+    request = _parse_chat_request(body)
+
     session = session_manager.get_session(request.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -111,15 +258,7 @@ async def send_message(request: ChatRequest):
     # When web search is active, append grounding instructions to system prompt
     system_prompt = session.system_prompt
     if request.web_search:
-        search_instruction = (
-            "\n\nIMPORTANT: The user has enabled web search. Their message includes "
-            "real-time search results with the current date and time. You MUST:"
-            "\n- Base your answer ONLY on the provided search results and conversation context."
-            "\n- NEVER invent facts, URLs, dates, or numbers that are not in the search results."
-            "\n- If the search results do not contain enough information, say so honestly."
-            "\n- Cite the source when referencing specific data from the results."
-        )
-        system_prompt = (system_prompt or "") + search_instruction
+        system_prompt = _with_search(system_prompt)
 
     # Build prompt messages with sliding window
     prompt_messages = build_prompt_messages(
@@ -129,68 +268,123 @@ async def send_message(request: ChatRequest):
         max_response_tokens=session.settings.max_response_tokens,
     )
 
-    # Replace the last user message content with search-augmented version
-    if request.web_search and user_content != request.message:
-        for msg in reversed(prompt_messages):
-            if msg["role"] == "user":
-                msg["content"] = user_content
-                break
-
-    # Transform last user message to include file contents if files attached
-    if request.files:
-        for msg in reversed(prompt_messages):
-            if msg["role"] == "user":
-                has_images = any(f.type.startswith("image/") for f in request.files)
-                # Use content-array format only if there are images (vision API)
-                if has_images:
-                    content_parts = [{"type": "text", "text": msg["content"]}]
-                    for f in request.files:
-                        if f.type.startswith("image/"):
-                            content_parts.append({
-                                "type": "image_url",
-                                "image_url": {"url": f.dataUrl},
-                            })
-                        else:
-                            extracted = _extract_file_text(f)
-                            content_parts.append({
-                                "type": "text",
-                                "text": extracted,
-                            })
-                    msg["content"] = content_parts
-                else:
-                    # Text-only files: append extracted content as plain text
-                    file_texts = []
-                    for f in request.files:
-                        file_texts.append(_extract_file_text(f))
-                    msg["content"] = msg["content"] + "\n\n" + "\n\n".join(file_texts)
-                break
+    # The just-added user turn is last unless the budget was too small to
+    # keep it, in which case there is nothing to rewrite
+    if prompt_messages and prompt_messages[-1]["role"] == "user":
+        # A fresh dict from build_prompt_messages, so stored history is
+        # untouched by the rewrites below
+        msg = prompt_messages[-1]
+
+        # Replace the last user message content with search-augmented version
+        if request.web_search and user_content != request.message:
+            msg["content"] = user_content
 
-    provider = _get_provider(session)
+        # Transform last user message to include file contents if files attached
+        if request.files:
+            # Classify attachments once; images go to the vision API as-is
+            is_image = [f.type.startswith("image/") for f in request.files]
+            # Parse non-image attachments in parallel, off the event loop
+            file_texts = iter(await asyncio.gather(*(
+                asyncio.to_thread(_extract_file_text, f)
+                for f, image in zip(request.files, is_image)
+                if not image
+            )))
+            # Use content-array format only if there are images (vision API)
+            if any(is_image):
+                content_parts = [{"type": "text", "text": msg["content"]}]
+                for f, image in zip(request.files, is_image):
+                    if image:
+                        content_parts.append({
+                            "type": "image_url",
+                            "image_url": {"url": f.dataUrl},
+                        })
+                    else:
+                        content_parts.append({
+                            "type": "text",
+                            "text": next(file_texts),
+                        })
+                msg["content"] = content_parts
+            else:
+                # Text-only files: append extracted content as plain text
+                msg["content"] = msg["content"] + "\n\n" + "\n\n".join(file_texts)
+
+    async def read_tokens(queue: asyncio.Queue):
+        """Feed provider tokens into *queue*, then ``_STREAM_END`` or the error."""
+        try:
+            async with _use_provider(session) as provider:
+                async for token in provider.send_message(
+                    messages=prompt_messages,
+                    model=session.settings.model,
+                    max_tokens=session.settings.max_response_tokens,
+                    temperature=session.settings.temperature,
+                ):
+                    queue.put_nowait(token)
+        except Exception as e:
+            queue.put_nowait(e)
+        else:
+            queue.put_nowait(_STREAM_END)
 
     async def event_generator():
-        full_response = ""
+        response_parts: list[str] = []
+        # Coalesce tokens that arrive within the batch window into one SSE
+        # event; the first token is always sent immediately. The provider is
+        # read in its own task so a pending batch is flushed at its deadline
+        # even while the model pauses between tokens.
+        loop = asyncio.get_running_loop()
+        window = settings.chat_sse_batch_ms / 1000
+        pending: list[str] = []
+        deadline = float("-inf")
+        queue: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(read_tokens(queue))
         try:
-            async for token in provider.send_message(
-                messages=prompt_messages,
-                model=session.settings.model,
-                max_tokens=session.settings.max_response_tokens,
-                temperature=session.settings.temperature,
-            ):
-                full_response += token
-                yield {"event": "token", "data": json.dumps({"token": token})}
+            while True:
+                if pending:
+                    try:
+                        item = await asyncio.wait_for(
+                            queue.get(), deadline - loop.time()
+                        )
+                    except asyncio.TimeoutError:
+                        item = None  # Deadline reached: flush what we have
+                else:
+                    item = await queue.get()
+
+                if isinstance(item, str):
+                    response_parts.append(item)
+                    pending.append(item)
+                    if (
+                        len(pending) < SSE_BATCH_MAX_TOKENS
+                        and loop.time() < deadline
+                    ):
+                        continue
+                elif item is not None:
+                    break  # End of stream or provider error
+
+                yield _sse_token("".join(pending))
+                pending.clear()
+                deadline = loop.time() + window
+                # Let the server write the batch out before the next
+                # token read; never between tokens of one batch
+                await asyncio.sleep(0)
+
+            if pending:
+                yield _sse_token("".join(pending))
+            if item is not _STREAM_END:
+                raise item
 
             # Save assistant response to session
+            full_response = "".join(response_parts)
             session_manager.add_message(
                 request.session_id, "assistant", full_response
             )
-            yield {
-                "event": "done",
-                "data": json.dumps({"content": full_response}),
-            }
+            yield _sse_event("done", {"content": full_response})
         except Exception as e:
-            yield {
-                "event": "error",
-                "data": json.dumps({"error": str(e)}),
-            }
+            yield _sse_event("error", {"error": str(e)})
+        finally:
+            # Client went away (or we are done): stop reading upstream
+            reader.cancel()
 
-    return EventSourceResponse(event_generator())
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -4,9 +4,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
-from backend.providers.base import ProviderConfig
-from backend.providers.ollama import OllamaProvider
-from backend.providers.openai_compat import OpenAICompatProvider
+from backend.providers.factory import use_provider
 from backend.config import settings, PROVIDER_PRESETS
 
 router = APIRouter(prefix="/api/providers", tags=["providers"])
@@ -43,24 +41,11 @@ async def test_connection(request: TestConnectionRequest):
     before the user starts chatting.
     """
     try:
-        if request.provider == "ollama":
-            provider = OllamaProvider(
-                ProviderConfig(
-                    base_url=request.base_url or settings.ollama_base_url,
-                )
-            )
-        else:
-            base_url = (
-                request.base_url
-                or settings.openai_compat_base_url
-                or "https://api.openai.com/v1"
-            )
-            api_key = request.api_key or settings.openai_compat_api_key
-            provider = OpenAICompatProvider(
-                ProviderConfig(base_url=base_url, api_key=api_key)
-            )
-
-        connected = await provider.validate_connection()
+        # Shared instance: a successful test warms the pool the chat will use
+        async with use_provider(
+            request.provider, request.base_url, request.api_key
+        ) as provider:
+            connected = await provider.validate_connection()
         if connected:
             return {"status": "connected", "message": "Connection successful"}
         else:
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from backend.sessions.manager import session_manager, SessionSettings
+from backend.utils.serialization import FastJSONResponse
 
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 
@@ -24,11 +25,16 @@ class UpdateSessionRequest(BaseModel):
     settings: Optional[SessionSettings] = None
 
 
+def _public_messages(messages) -> list[dict]:
+    """Project stored messages to the API shape (drops internal keys)."""
+    return [{"role": m["role"], "content": m["content"]} for m in messages]
+
+
 @router.get("")
 async def list_sessions():
     """List all sessions, sorted by most recently updated."""
     sessions = session_manager.list_sessions()
-    return [
+    return FastJSONResponse([
         {
             "id": s.id,
             "title": s.title,
@@ -39,7 +45,7 @@ async def list_sessions():
             "provider": s.settings.provider,
         }
         for s in sessions
-    ]
+    ])
 
 
 @router.post("")
@@ -53,14 +59,14 @@ async def create_session(request: CreateSessionRequest):
         api_key=request.api_key,
         model=request.model,
     )
-    return {
+    return FastJSONResponse({
         "id": session.id,
         "title": session.title,
         "system_prompt": session.system_prompt,
-        "settings": session.settings.model_dump(),
-        "messages": session.messages,
+        "settings": session.settings_dict(),
+        "messages": _public_messages(session.messages),
         "created_at": session.created_at,
-    }
+    })
 
 
 @router.get("/{session_id}")
@@ -69,15 +75,15 @@ async def get_session(session_id: str):
     session = session_manager.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return {
+    return FastJSONResponse({
         "id": session.id,
         "title": session.title,
         "system_prompt": session.system_prompt,
-        "settings": session.settings.model_dump(),
-        "messages": session.messages,
+        "settings": session.settings_dict(),
+        "messages": _public_messages(session.messages),
         "created_at": session.created_at,
         "updated_at": session.updated_at,
-    }
+    })
 
 
 @router.put("/{session_id}")
@@ -95,14 +101,14 @@ async def update_session(session_id: str, request: UpdateSessionRequest):
         session_manager.update_session(session_id, settings=request.settings)
 
     updated = session_manager.get_session(session_id)
-    return {
+    return FastJSONResponse({
         "id": updated.id,
         "title": updated.title,
         "system_prompt": updated.system_prompt,
-        "settings": updated.settings.model_dump(),
-        "messages": updated.messages,
+        "settings": updated.settings_dict(),
+        "messages": _public_messages(updated.messages),
         "updated_at": updated.updated_at,
-    }
+    })
 
 
 @router.delete("/{session_id}")
@@ -119,9 +125,9 @@ async def clear_session_memory(session_id: str):
     session = session_manager.clear_memory(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return {
+    return FastJSONResponse({
         "id": session.id,
         "title": session.title,
-        "messages": session.messages,
+        "messages": _public_messages(session.messages),
         "status": "cleared",
-    }
+    })
@@ -4,16 +4,20 @@ Each session holds its own system prompt, message history, model selection,
 and performance settings. Sessions are fully isolated.
 """
 
+import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from backend.utils.tokens import estimate_message_tokens
 from backend.config import (
     SYSTEM_PROMPT_PRESETS,
     DEFAULT_LOCAL_CONTEXT,
     DEFAULT_LOCAL_MAX_TOKENS,
+    MAX_STORED_MESSAGES,
 )
 
 
@@ -34,10 +38,35 @@ class Session(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str = "New Chat"
     system_prompt: str = SYSTEM_PROMPT_PRESETS["default"]
-    messages: list[dict] = Field(default_factory=list)
+    # Bounded: appends are O(1) and the oldest messages fall off the front
+    messages: deque[dict] = Field(
+        default_factory=lambda: deque(maxlen=MAX_STORED_MESSAGES)
+    )
     settings: SessionSettings = Field(default_factory=SessionSettings)
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+    # Last-modified time as epoch nanoseconds: cheap to stamp on every
+    # message and to sort by; formatted only when the API reports it
+    _updated_ns: int = PrivateAttr(default_factory=time.time_ns)
+
+    # Plain-dict copy of ``settings`` for API responses; reset whenever
+    # SessionManager.update_session runs
+    _settings_cache: Optional[dict] = PrivateAttr(default=None)
+
+    @property
+    def updated_at(self) -> str:
+        """Last-modified time as an ISO-8601 string (same format as ``created_at``)."""
+        return datetime.fromtimestamp(self._updated_ns / 1e9).isoformat()
+
+    def settings_dict(self) -> dict:
+        """``settings`` as a plain dict, built once per settings change.
+
+        SessionSettings is flat, so its ``__dict__`` matches ``model_dump()``.
+        Treat the result as read-only; it is shared between responses.
+        """
+        if self._settings_cache is None:
+            self._settings_cache = dict(self.settings.__dict__)
+        return self._settings_cache
 
 
 class SessionManager:
@@ -48,7 +77,9 @@ class SessionManager:
     """
 
     def __init__(self):
-        self._sessions: dict[str, Session] = {}
+        # Kept in most-recently-updated-first order: mutators move the
+        # session they touch to the front, so listing never has to sort
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
         # Create a default session
         default = Session()
         self._sessions[default.id] = default
@@ -79,6 +110,7 @@ class SessionManager:
             settings=SessionSettings(**settings_kwargs) if settings_kwargs else SessionSettings(),
         )
         self._sessions[session.id] = session
+        self._sessions.move_to_end(session.id, last=False)
         return session
 
     def get_session(self, session_id: str) -> Optional[Session]:
@@ -87,11 +119,7 @@ class SessionManager:
 
     def list_sessions(self) -> list[Session]:
         """List all sessions, sorted by most recently updated."""
-        return sorted(
-            self._sessions.values(),
-            key=lambda s: s.updated_at,
-            reverse=True,
-        )
+        return list(self._sessions.values())
 
     def update_session(self, session_id: str, **kwargs) -> Optional[Session]:
         """Update session fields."""
@@ -101,7 +129,9 @@ class SessionManager:
         for key, value in kwargs.items():
             if hasattr(session, key):
                 setattr(session, key, value)
-        session.updated_at = datetime.now().isoformat()
+        session._settings_cache = None
+        session._updated_ns = time.time_ns()
+        self._sessions.move_to_end(session_id, last=False)
         return session
 
     def delete_session(self, session_id: str) -> bool:
@@ -116,8 +146,12 @@ class SessionManager:
         session = self._sessions.get(session_id)
         if not session:
             return None
-        session.messages.append({"role": role, "content": content})
-        session.updated_at = datetime.now().isoformat()
+        message = {"role": role, "content": content}
+        # Messages never change once stored, so estimate their size once
+        message["_tokens"] = estimate_message_tokens(message)
+        session.messages.append(message)
+        session._updated_ns = time.time_ns()
+        self._sessions.move_to_end(session_id, last=False)
 
         # Auto-title from first user message
         if role == "user" and session.title == "New Chat":
@@ -130,8 +164,9 @@ class SessionManager:
         session = self._sessions.get(session_id)
         if not session:
             return None
-        session.messages = []
-        session.updated_at = datetime.now().isoformat()
+        session.messages.clear()
+        session._updated_ns = time.time_ns()
+        self._sessions.move_to_end(session_id, last=False)
         return session
 
 
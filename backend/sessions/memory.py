@@ -4,10 +4,19 @@ Strategy: Keep the most recent messages that fit within a token budget.
 Short exchanges preserve more turns; long code-heavy ones keep fewer.
 """
 
+from functools import lru_cache
+from typing import Sequence
+
 from backend.utils.tokens import estimate_tokens, estimate_message_tokens
 from backend.config import MAX_HISTORY_MESSAGES
 
 
+@lru_cache(maxsize=256)
+def _system_prompt_tokens(system_prompt: str) -> int:
+    """Token estimate of a system prompt; the same few prompts recur."""
+    return estimate_tokens(system_prompt)
+
+
 def compute_history_budget(
     max_context: int,
     system_prompt: str,
@@ -17,13 +26,13 @@ def compute_history_budget(
 
     history_budget = max_context - system_prompt_tokens - max_response_tokens
     """
-    system_tokens = estimate_tokens(system_prompt)
+    system_tokens = _system_prompt_tokens(system_prompt)
     budget = max_context - system_tokens - max_response_tokens
     return max(budget, 0)
 
 
 def trim_messages_to_budget(
-    messages: list[dict],
+    messages: Sequence[dict],
     budget: int,
     max_messages: int = MAX_HISTORY_MESSAGES,
 ) -> list[dict]:
@@ -57,7 +66,7 @@ def trim_messages_to_budget(
 
 def build_prompt_messages(
     system_prompt: str,
-    history: list[dict],
+    history: Sequence[dict],
     max_context: int,
     max_response_tokens: int,
 ) -> list[dict]:
@@ -73,6 +82,10 @@ def build_prompt_messages(
     prompt_messages = []
     if system_prompt.strip():
         prompt_messages.append({"role": "system", "content": system_prompt})
-    prompt_messages.extend(trimmed)
+    # Fresh role/content dicts: drops internal keys such as ``_tokens`` that
+    # providers would reject, and keeps stored history safe from callers
+    prompt_messages.extend(
+        {"role": m["role"], "content": m["content"]} for m in trimmed
+    )
 
     return prompt_messages
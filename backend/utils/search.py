@@ -3,57 +3,205 @@
 import asyncio
 import re
 from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
 
 import httpx
+from cachetools import TTLCache
 from duckduckgo_search import DDGS
 
+try:
+    # C-backed (lexbor) HTML parser. Not ``selectolax.parser``: that older
+    # backend raises ImportError on selectolax >= 1.0.
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # pragma: no cover - regex fallback below
+    HTMLParser = None
+
+# DuckDuckGo's no-JS results page: plain HTML, fetchable with a normal client
+_DDG_HTML_URL = "https://html.duckduckgo.com/html/"
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+}
+
+# Shared pool for search and page fetches, created on first use
+_client: Optional[httpx.AsyncClient] = None
+
+# Read at most this much of a fetched page; the <head> alone can be tens of KB
+_MAX_PAGE_BYTES = 64 * 1024
+
+# Results whose full page text is fetched (concurrently) for grounding
+_DETAILED_SOURCES = 3
+
+# Search results and page text are stable for minutes; repeat queries and
+# URLs are served from memory instead of the network
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=512, ttl=300)
+_PAGE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+# In-flight fetches by cache key, so concurrent identical requests share one
+_inflight: dict[tuple, asyncio.Future] = {}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
 
 def _strip_html(html: str) -> str:
     """Remove HTML tags and collapse whitespace."""
-    text = re.sub(r"<[^>]+>", " ", html)
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    if HTMLParser is not None:
+        text = HTMLParser(html).text(separator=" ")
+    else:
+        text = _TAG_RE.sub(" ", html)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared search client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=_HEADERS, follow_redirects=True, timeout=10.0
+        )
+    return _client
+
+
+async def close_search_client():
+    """Close the shared search client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _cached(cache: TTLCache, key: tuple, fetch):
+    """Return ``cache[key]``, running ``fetch()`` at most once per key at a time.
+
+    Concurrent callers for the same key await the same in-flight fetch.
+    Empty results are not cached so a transient failure is retried.
+    """
+    if key in cache:
+        return cache[key]
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(fetch())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded: one caller going away must not cancel the shared fetch
+    value = await asyncio.shield(future)
+    if value:
+        cache[key] = value
+    return value
 
 
 async def _fetch_page_text(url: str, timeout: float = 5.0) -> str:
-    """Fetch a URL and return stripped plain text, truncated to ~1500 chars."""
+    """Cached wrapper around ``_download_page_text``."""
+    if not url:
+        return ""
+    return await _cached(
+        _PAGE_CACHE, ("page", url), lambda: _download_page_text(url, timeout)
+    )
+
+
+async def _download_page_text(url: str, timeout: float = 5.0) -> str:
+    """Fetch a URL and return stripped plain text, truncated to ~1500 chars.
+
+    Only the first ``_MAX_PAGE_BYTES`` of the body are read — plenty for
+    1500 chars of text, and multi-MB pages are not downloaded in full.
+    """
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            resp = await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        async with _get_client().stream("GET", url, timeout=timeout) as resp:
             resp.raise_for_status()
-            text = _strip_html(resp.text)
-            return text[:1500]
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes(chunk_size=8192):
+                buf += chunk
+                if len(buf) >= _MAX_PAGE_BYTES:
+                    break
+            html = buf.decode(resp.encoding or "utf-8", errors="replace")
+        text = _strip_html(html)
+        return text[:1500]
     except Exception:
         return ""
 
 
+def _result_url(href: str) -> str:
+    """Unwrap DuckDuckGo's ``/l/?uddg=<target>`` redirect links."""
+    target = parse_qs(urlparse(href).query).get("uddg")
+    return target[0] if target else href
+
+
+async def _ddg_html_search(query: str, num_results: int = 5) -> list[dict]:
+    """Scrape DuckDuckGo's HTML results page.
+
+    Returns dicts shaped like ``DDGS.text`` results (title, href, body).
+    Needs selectolax; returns an empty list when it is not installed.
+    """
+    if HTMLParser is None:
+        return []
+    resp = await _get_client().get(_DDG_HTML_URL, params={"q": query})
+    resp.raise_for_status()
+    results = []
+    for node in HTMLParser(resp.text).css("div.result"):
+        # Skip sponsored entries
+        if "result--ad" in (node.attributes.get("class") or ""):
+            continue
+        link = node.css_first("a.result__a")
+        if link is None or not link.attributes.get("href"):
+            continue
+        snippet = node.css_first(".result__snippet")
+        results.append({
+            "title": _WS_RE.sub(" ", link.text()).strip(),
+            "href": _result_url(link.attributes["href"]),
+            "body": _WS_RE.sub(" ", snippet.text()).strip() if snippet is not None else "",
+        })
+        if len(results) >= num_results:
+            break
+    return results
+
+
 def _ddg_search(query: str, num_results: int = 5) -> list[dict]:
-    """Run DuckDuckGo text search (sync, runs in thread)."""
+    """Run DuckDuckGo text search via duckduckgo_search (sync, fallback)."""
     with DDGS() as ddgs:
         return list(ddgs.text(query, max_results=num_results))
 
 
+async def _search(query: str, num_results: int = 5) -> list[dict]:
+    """Search natively over HTTP, falling back to the DDGS library."""
+    try:
+        results = await _ddg_html_search(query, num_results)
+    except Exception:
+        results = []
+    if results:
+        return results
+    # Layout change, rate limit or no selectolax: the library path is slower
+    # (blocking, runs in a thread) but copes with those on its own
+    return await asyncio.to_thread(_ddg_search, query, num_results)
+
+
 async def web_search(query: str, num_results: int = 5) -> str:
     """Search the web for *query* and return a formatted context block.
 
     - Uses DuckDuckGo for top results (title, snippet, URL).
-    - Fetches the full page text of the #1 result in parallel.
+    - Fetches the full page text of the top ``_DETAILED_SOURCES`` results
+      concurrently, overlapping the network waits with formatting.
     - Returns empty string on any failure (graceful degradation).
     """
     try:
-        # Run DDG search in a thread (it's synchronous)
-        loop = asyncio.get_running_loop()
-        results = await loop.run_in_executor(None, _ddg_search, query, num_results)
+        results = await _cached(
+            _SEARCH_CACHE,
+            ("search", query, num_results),
+            lambda: _search(query, num_results),
+        )
 
         if not results:
             return ""
 
-        # Fetch top result page in parallel with formatting
-        top_url = results[0].get("href", "")
-        page_text_task = asyncio.create_task(_fetch_page_text(top_url)) if top_url else None
-
-        # Wait for page fetch
-        page_text = await page_text_task if page_text_task else ""
+        # Start the page fetches right away, then format while they run
+        detailed = results[:_DETAILED_SOURCES]
+        fetches = [
+            asyncio.create_task(_fetch_page_text(r.get("href", ""))) for r in detailed
+        ]
 
         # Build formatted context block
         now = datetime.now(timezone.utc)
@@ -61,26 +209,29 @@ async def web_search(query: str, num_results: int = 5) -> str:
         lines = [f"[Current date and time: {date_str}]"]
         lines.append(f'[Web Search Results for: "{query}"]\n')
 
-        # Detailed top source
-        top = results[0]
-        lines.append("[Detailed source]")
-        lines.append(f"{top.get('title', '')} ({top.get('href', '')})")
-        if page_text:
-            lines.append(page_text)
-        else:
-            lines.append(top.get("body", ""))
-        lines.append("")
-
-        # Additional sources
-        if len(results) > 1:
-            lines.append("[Additional sources]")
-            for i, r in enumerate(results[1:], start=2):
+        # Additional sources (snippets only)
+        additional = []
+        if len(results) > len(detailed):
+            additional.append("[Additional sources]")
+            for i, r in enumerate(results[len(detailed):], start=len(detailed) + 1):
                 title = r.get("title", "")
                 snippet = r.get("body", "")
                 url = r.get("href", "")
-                lines.append(f"{i}. {title} - {snippet} ({url})")
+                additional.append(f"{i}. {title} - {snippet} ({url})")
+            additional.append("")
+
+        page_texts = await asyncio.gather(*fetches, return_exceptions=True)
+
+        # Detailed top sources (page text, or the snippet if the fetch failed)
+        lines.append("[Detailed sources]")
+        for r, page_text in zip(detailed, page_texts):
+            if isinstance(page_text, BaseException):
+                page_text = ""
+            lines.append(f"{r.get('title', '')} ({r.get('href', '')})")
+            lines.append(page_text or r.get("body", ""))
             lines.append("")
 
+        lines.extend(additional)
         return "\n".join(lines)
 
     except Exception:
@@ -0,0 +1,50 @@
+"""JSON helpers for the streaming hot paths.
+
+Uses orjson when it is installed (several times faster on the small
+per-token payloads) and falls back to the stdlib ``json`` module otherwise.
+Both variants accept ``bytes`` input; ``dumps`` returns ``str`` and
+``dumps_bytes`` returns UTF-8 ``bytes`` ready to write to a socket.
+``FastJSONResponse`` renders API responses with the same backend.
+"""
+
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of which backend is active.
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    loads = orjson.loads
+    dumps_bytes = orjson.dumps
+
+    def dumps(obj) -> str:
+        """Serialize *obj* to a compact JSON string."""
+        return orjson.dumps(obj).decode()
+else:
+    loads = json.loads
+
+    def dumps(obj) -> str:
+        """Serialize *obj* to a compact JSON string."""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_bytes(obj) -> bytes:
+        """Serialize *obj* to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps_bytes``.
+
+    Return it directly from an endpoint with plain dict/list/str/number
+    content; FastAPI then skips its ``jsonable_encoder`` pass.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
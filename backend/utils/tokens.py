@@ -19,7 +19,10 @@ def estimate_message_tokens(message: dict) -> int:
 
     Accounts for role overhead (~4 tokens per message for formatting).
     Content may be a string or a vision content-array (list of parts).
+    Stored history messages carry a precomputed ``_tokens`` estimate.
     """
+    if "_tokens" in message:
+        return message["_tokens"]
     content = message.get("content", "")
     role_overhead = 4
     if isinstance(content, list):
@@ -198,7 +198,7 @@ export default function App() {
               provider={provider}
               baseUrl={baseUrl}
               apiKey={apiKey}
-              onRefresh={fetchModels}
+              onRefresh={() => fetchModels({ refresh: true })}
               loading={modelsLoading}
             />
 
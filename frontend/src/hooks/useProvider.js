@@ -39,12 +39,12 @@ export default function useProvider() {
   }, []);
 
   // Load models when provider or connection details change
-  const fetchModels = useCallback(async () => {
+  const fetchModels = useCallback(async ({ refresh = false } = {}) => {
     setLoading(true);
     try {
       const url = provider === 'ollama' ? undefined : baseUrl || undefined;
       const key = provider === 'ollama' ? undefined : apiKey || undefined;
-      const data = await listModels(provider, url, key);
+      const data = await listModels(provider, url, key, refresh);
       setModels(data.models || []);
     } catch {
       setModels([]);
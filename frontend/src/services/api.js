@@ -120,10 +120,12 @@ export function streamChat(sessionId, message, webSearch, files, onToken, onDone
 
 // --- Models ---
 
-export async function listModels(provider, baseUrl, apiKey) {
+export async function listModels(provider, baseUrl, apiKey, refresh = false) {
   const params = new URLSearchParams({ provider });
   if (baseUrl) params.set('base_url', baseUrl);
   if (apiKey) params.set('api_key', apiKey);
+  // Bypass the backend's short-lived model cache (e.g. after `ollama pull`)
+  if (refresh) params.set('refresh', 'true');
   return request(`/models?${params}`);
 }
 
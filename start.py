@@ -3,71 +3,316 @@ Launch both backend and frontend servers with a single command.
 
 Usage:
     python start.py
+    python start.py --only backend     # or --only frontend
+    python start.py --no-reload        # backend without auto-reload
 
 Press Ctrl+C to stop both servers.
 """
 
+import argparse
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+import select
 import signal
 import os
+import shutil
+import threading
+import time
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(ROOT, "frontend")
 
+PY = sys.executable
+# Resolved once here so the child exec needs no PATH search (npm.cmd on Windows)
+NPM = shutil.which("npm.cmd" if sys.platform == "win32" else "npm") or "npm"
+
+BACKEND_CMD = (PY, "-m", "uvicorn", "backend.main:app", "--port", "8000",
+               "--timeout-keep-alive", "75")
+# Watch only the backend sources (not frontend/node_modules); uvicorn uses
+# the event-driven watchfiles reloader that uvicorn[standard] installs,
+# which already debounces bursts of changes such as a multi-file save
+RELOAD_ARGS = ("--reload", "--reload-dir", "backend")
+FRONTEND_CMD = (NPM, "run", "dev")
+
 processes = []
 
+# Set once shutdown starts; a second Ctrl+C (or a signal arriving while a
+# crashed server is being handled) must not restart the stop sequence
+_stopping = threading.Event()
+
+# Seconds a server gets to exit after the polite stop signal
+STOP_GRACE = 2.0
+
+# Start each server as the leader of its own process group, so stopping it
+# also reaches what it spawned (npm -> node -> Vite/esbuild)
+if sys.platform == "win32":
+    SPAWN_KWARGS = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    # A new session is not the terminal's foreground group: keep the
+    # servers off the tty so a read cannot stop them with SIGTTIN
+    SPAWN_KWARGS = {"start_new_session": True, "stdin": subprocess.DEVNULL}
+
+# Server output goes through a pipe per server and is re-printed line by
+# line with a name prefix, so the two logs never interleave mid-line
+SPAWN_KWARGS.update(stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+CHILD_ENV = {**os.environ, "PYTHONUNBUFFERED": "1"}
+if sys.stdout.isatty():
+    # Behind a pipe the servers would turn colors off; the terminal is ours
+    CHILD_ENV["FORCE_COLOR"] = "1"
+
+_readers = []
+
 
-def shutdown(sig=None, frame=None):
+def _relay_output(name, pipe):
+    """Print a server's output with a ``[name]`` prefix until it closes."""
+    prefix = f"[{name}]".ljust(11)
+    for line in iter(pipe.readline, b""):
+        print(prefix + line.decode(errors="replace"), end="", flush=True)
+    pipe.close()
+
+
+def _signal_group(proc, sig):
+    """Send *sig* to the process group *proc* leads (POSIX)."""
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass  # The whole group is already gone
+
+
+def _group_alive(proc):
+    """Whether any process is left in the group *proc* leads (POSIX)."""
+    try:
+        os.killpg(proc.pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists, but a member changed credentials
+    return True
+
+
+def shutdown(sig=None, frame=None, exit_code=0):
+    if _stopping.is_set():
+        return
+    _stopping.set()
     print("\n Shutting down...")
     for name, proc in processes:
         if proc.poll() is None:
             print(f"  Stopping {name}...")
-            proc.terminate()
+            if sys.platform == "win32":
+                proc.send_signal(signal.CTRL_BREAK_EVENT)
+        if sys.platform != "win32":
+            # Even if the leader is gone, its children may not be
+            _signal_group(proc, signal.SIGTERM)
+    deadline = time.monotonic() + STOP_GRACE
     for name, proc in processes:
-        proc.wait()
+        try:
+            proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            print(f"  Killing {name}...")
+            if sys.platform == "win32":
+                proc.kill()
+            else:
+                _signal_group(proc, signal.SIGKILL)
+            proc.wait()
+    if sys.platform != "win32":
+        # A leader (npm) can exit before its children (Vite, esbuild) finish
+        # their own cleanup: they get the rest of the grace period, and only
+        # what is still running after that is killed
+        for name, proc in processes:
+            while _group_alive(proc) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            if _group_alive(proc):
+                print(f"  Killing what is left of {name}...")
+                _signal_group(proc, signal.SIGKILL)
+    # The pipes close once every process in each group is gone
+    for reader in _readers:
+        reader.join(timeout=1)
     print("  All servers stopped.")
-    sys.exit(0)
+    sys.exit(exit_code)
 
 
 signal.signal(signal.SIGINT, shutdown)
 signal.signal(signal.SIGTERM, shutdown)
 
 
-def main():
-    # --- Backend (FastAPI + Uvicorn) ---
-    print("[backend]  Starting on http://localhost:8000")
-    backend = subprocess.Popen(
-        [sys.executable, "-m", "uvicorn", "backend.main:app", "--reload", "--port", "8000"],
-        cwd=ROOT,
-    )
-    processes.append(("backend", backend))
+def _wait_pidfd():
+    """Sleep in epoll on one pidfd per child until a child exits (Linux)."""
+    by_fd = {}
+    epoll = select.epoll()
+    try:
+        for name, proc in processes:
+            fd = os.pidfd_open(proc.pid, 0)
+            by_fd[fd] = (name, proc)
+            epoll.register(fd, select.EPOLLIN)
+        fd, _ = epoll.poll()[0]
+        return by_fd[fd]
+    finally:
+        epoll.close()
+        for fd in by_fd:
+            os.close(fd)
 
-    # --- Frontend (Vite) ---
-    # Use npm.cmd on Windows, npm elsewhere
-    npm = "npm.cmd" if sys.platform == "win32" else "npm"
-    print("[frontend] Starting on http://localhost:3000")
-    frontend = subprocess.Popen(
-        [npm, "run", "dev"],
-        cwd=FRONTEND_DIR,
-    )
-    processes.append(("frontend", frontend))
 
-    print("\nBoth servers running. Press Ctrl+C to stop.\n")
+def _wait_kqueue():
+    """Sleep in kevent on EVFILT_PROC/NOTE_EXIT until a child exits (macOS/BSD)."""
+    by_pid = {proc.pid: (name, proc) for name, proc in processes}
+    kq = select.kqueue()
+    try:
+        changes = [
+            select.kevent(
+                pid,
+                filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ENABLE | select.KQ_EV_ONESHOT,
+                fflags=select.KQ_NOTE_EXIT,
+            )
+            for pid in by_pid
+        ]
+        # Registering an already-exited pid raises (ESRCH); the caller's
+        # fallback wait then sees the exit straight away
+        kq.control(changes, 0)
+        event = kq.control(None, 1)[0]
+        return by_pid[event.ident]
+    finally:
+        kq.close()
+
 
-    # Wait for either process to exit
+def _wait_waitid():
+    """Block in waitid() until any child exits (other POSIX systems).
+
+    WNOWAIT leaves the child a zombie, so proc.wait() still collects its
+    exit code afterwards.
+    """
+    by_pid = {proc.pid: (name, proc) for name, proc in processes}
     while True:
-        for name, proc in processes:
-            ret = proc.poll()
-            if ret is not None:
-                print(f"\n[{name}] exited with code {ret}. Shutting down...")
-                shutdown()
+        info = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOWAIT)
+        if info.si_pid in by_pid:
+            return by_pid[info.si_pid]
+        # Not one of ours: reap it so the next waitid() does not report it again
+        os.waitpid(info.si_pid, 0)
+
 
-        # Avoid busy-waiting
+def _wait_poll():
+    """Poll the children until one exits (portable fallback).
+
+    Starts at a quarter second, when exits are likely (bad config, port in
+    use), and backs off to at most every 30 s over a long session.
+    """
+    (first_name, first), (second_name, second) = processes
+    timeout = 0.25
+    while True:
+        # wait() polls ``first`` itself, so only ``second`` needs a check
         try:
-            processes[0][1].wait(timeout=1)
+            first.wait(timeout=timeout)
+            return first_name, first
         except subprocess.TimeoutExpired:
+            if second.poll() is not None:
+                return second_name, second
+        timeout = min(timeout * 1.5, 30.0)
+
+
+def wait_for_exit():
+    """Block until either server exits and return its (name, proc).
+
+    Uses a kernel exit notification where the platform has one, so the
+    supervisor stays idle instead of waking up every second.
+    """
+    if hasattr(os, "pidfd_open"):
+        try:
+            return _wait_pidfd()
+        except OSError:
+            pass  # Kernel older than 5.3
+    elif hasattr(select, "kqueue"):
+        try:
+            return _wait_kqueue()
+        except OSError:
             pass
+    if hasattr(os, "waitid"):
+        return _wait_waitid()
+    return _wait_poll()
+
+
+def run_only(cmd, cwd):
+    """Replace this process with a single server (no supervisor needed)."""
+    os.chdir(cwd)
+    if sys.platform == "win32":
+        # Windows has no real exec: os.execvp would detach from the console
+        sys.exit(subprocess.call(cmd))
+    os.execvp(cmd[0], cmd)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Launch the backend and frontend dev servers."
+    )
+    parser.add_argument(
+        "--only",
+        choices=("backend", "frontend"),
+        help="run just one server, in place of this launcher",
+    )
+    parser.add_argument(
+        "--no-reload",
+        action="store_true",
+        help="run the backend without uvicorn's file watcher",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    backend_cmd = BACKEND_CMD if args.no_reload else BACKEND_CMD + RELOAD_ARGS
+    if sys.stdout.isatty():
+        backend_cmd += ("--use-colors",)
+
+    if args.only == "backend":
+        run_only(backend_cmd, ROOT)
+    elif args.only == "frontend":
+        run_only(FRONTEND_CMD, FRONTEND_DIR)
+
+    # Spawn both servers at once so their fork/exec and startup overlap
+    print("[backend]  Starting on http://localhost:8000")
+    print("[frontend] Starting on http://localhost:3000")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # --- Backend (FastAPI + Uvicorn) ---
+        backend = pool.submit(
+            subprocess.Popen,
+            backend_cmd,
+            cwd=ROOT,
+            env=CHILD_ENV,
+            **SPAWN_KWARGS,
+        )
+        # --- Frontend (Vite) ---
+        frontend = pool.submit(
+            subprocess.Popen,
+            FRONTEND_CMD,
+            cwd=FRONTEND_DIR,
+            env=CHILD_ENV,
+            **SPAWN_KWARGS,
+        )
+
+    # Record every server that started before acting on a failure, so
+    # shutdown() also stops the one that did come up
+    failed = False
+    for name, future in (("backend", backend), ("frontend", frontend)):
+        try:
+            proc = future.result()
+        except OSError as e:
+            print(f"[{name}] Failed to start: {e}")
+            failed = True
+            continue
+        processes.append((name, proc))
+        reader = threading.Thread(
+            target=_relay_output, args=(name, proc.stdout), daemon=True
+        )
+        reader.start()
+        _readers.append(reader)
+    if failed:
+        shutdown(exit_code=1)
+
+    print("\nBoth servers running. Press Ctrl+C to stop.\n")
+
+    name, proc = wait_for_exit()
+    print(f"\n[{name}] exited with code {proc.wait()}. Shutting down...")
+    shutdown()
 
 
 if __name__ == "__main__":